@@ -2,237 +2,571 @@
 import gradio as gr
 import snowflake.connector
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import re
 import os
+import time
+import hashlib
+import gzip
+import threading
+import tempfile
+import shutil
+import atexit
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    # Optional: enables Parquet report downloads
+    import pyarrow as pa
+    import pyarrow.parquet as pa_parquet
+except ImportError:
+    pa = None
+
+# Report status and difference labels (shared across every result row)
+STATUS_PASS = "✅ PASS"
+STATUS_FAIL = "❌ FAIL"
+STATUS_EXECUTION_ERROR = "❌ EXECUTION ERROR"
+STATUS_PERMISSION_ERROR = "❌ PERMISSION ERROR"
+KPI_MATCH = "✅ Match"
+KPI_MISMATCH = "⚠️ Mismatch"
+KPI_ERROR = "❌ Error"
+TABLE_DROPPED = "Missing in source - Table Dropped"
+TABLE_ADDED = "Missing in clone - Table Added"
+COLUMN_DROPPED = "Missing in source - Column Dropped"
+COLUMN_ADDED = "Missing in clone - Column Added"
+DATA_TYPE_CHANGED = "Data Type Changed"
+
+# ORDER_KPIS names behind the KPI checkboxes, in checkbox order (adjust to your KPI table)
+KPI_NAMES = (
+    "Total Orders",
+    "Total Revenue",
+    "Average Order Value",
+    "Max Order Value",
+    "Min Order Value",
+    "Completed Orders",
+    "Cancelled Orders",
+    "Orders in April 2025",
+    "Unique Customers"
+)
+
+# Static assets served by Gradio (browser-cacheable)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+LOGO_PATH = os.path.join(STATIC_DIR, "logo.png")
+CSS_PATH = os.path.join(STATIC_DIR, "app.css")                     # layout rules, inlined in the page
+DEFERRED_CSS_PATH = os.path.join(STATIC_DIR, "app-deferred.css")   # cosmetic rules, loaded after first paint
+
+# Test case queries sent per multi-statement request
+TEST_CASE_BATCH_SIZE = 1000
+
+# Plain (unquoted) Snowflake identifier; database/schema/table names must match before
+# they are placed into SQL text, since identifiers cannot be bound as parameters
+IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_$]*$')
+
+# Unqualified ORDER_DATA references in KPI SQL, rewritten to a schema-qualified name
+ORDER_DATA_RE = re.compile(r'\bORDER_DATA\b', re.IGNORECASE)
+
+# Upper bound on concurrent DESCRIBE TABLE round trips in schema validation
+MAX_DESCRIBE_WORKERS = 16
+
+# Connection pool: idle sessions kept per login, and how long a session may be reused
+POOL_MAX_SIZE = 10
+POOL_LIFETIME = 30 * 60
+# How often idle pooled sessions are checked for expiry (they heartbeat until closed)
+POOL_REAP_INTERVAL = 60
+
+connection_pools = {}     # pool key -> list of idle (conn, created_at)
+pooled_connections = {}   # id(conn) -> (pool key, created_at) for connections in use
+pool_lock = threading.Lock()
+
+# A clone made within this many seconds is treated as drift-free by DriftWatch
+FRESH_CLONE_WINDOW = 5 * 60
+
+# Metadata cache: SHOW DATABASES/SCHEMAS/TABLES results are reused for this many seconds
+METADATA_CACHE_TTL = 120
+
+metadata_cache = {}       # (id(conn), kind, *names) -> (cached_at, value)
+
+# Cursors are reused per connection, one per thread: {(id(conn), thread id): cursor}.
+# A cursor keeps its connection alive, so entries are dropped when the connection is released.
+cursor_cache = {}
+cursor_cache_lock = threading.Lock()
+
+# Downloadable reports are written here (not the working directory) and removed on exit
+REPORT_DIR = tempfile.mkdtemp(prefix="deploysure_reports_")
+atexit.register(shutil.rmtree, REPORT_DIR, ignore_errors=True)
+
+# Shared empty result for early-exit paths (never mutated)
+EMPTY_DF = pd.DataFrame()
+
+# Recently written report files, reused when the same report is downloaded again
+REPORT_CACHE_SIZE = 32
+report_files = OrderedDict()   # report fingerprint -> file path, oldest first
+report_files_lock = threading.Lock()
+
+# Download formats offered for reports as (label, value); Parquet only when pyarrow is installed
+REPORT_FORMATS = [("CSV", "csv"), ("CSV (gzip)", "csv.gz")]
+if pa is not None:
+    REPORT_FORMATS.append(("Parquet", "parquet"))
+# Fastest gzip level: the transfer saving is nearly the same and compression stays cheap
+REPORT_GZIP_LEVEL = 1
 
 # ========== SNOWFLAKE FUNCTIONS ==========
+def get_cursor(conn):
+    """Return this thread's cached cursor for conn, creating it on first use"""
+    key = (id(conn), threading.get_ident())
+    cursor = cursor_cache.get(key)
+    if cursor is None or cursor.connection is not conn or cursor.is_closed():
+        cursor = conn.cursor()
+        with cursor_cache_lock:
+            cursor_cache[key] = cursor
+    return cursor
+
+def forget_cursors(conn):
+    """Drop every thread's cached cursor for conn so the connection can be freed"""
+    with cursor_cache_lock:
+        for key in [key for key in cursor_cache if key[0] == id(conn)]:
+            del cursor_cache[key]
+
+def connection_pool_key(user, password, account):
+    """Pool key for a login (the password is hashed so pooled sessions need the same credentials)"""
+    return (user, account, hashlib.sha256(password.encode()).hexdigest())
+
+def is_connection_alive(conn):
+    """Check that a pooled connection can still run queries"""
+    try:
+        if conn.is_closed():
+            return False
+        get_cursor(conn).execute("SELECT 1")
+        return True
+    except Exception:
+        return False
+
+def acquire_pooled_connection(key):
+    """Take a live, unexpired connection for this login out of the pool"""
+    while True:
+        with pool_lock:
+            idle = connection_pools.get(key)
+            if not idle:
+                return None
+            conn, created_at = idle.pop()
+
+        if time.monotonic() - created_at < POOL_LIFETIME and is_connection_alive(conn):
+            with pool_lock:
+                pooled_connections[id(conn)] = (key, created_at)
+            return conn
+
+        forget_cursors(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+def release_pooled_connection(conn):
+    """Return a connection to its pool, closing it if expired or the pool is full"""
+    # Cached metadata is keyed by id(conn), which a later connection may reuse
+    invalidate_metadata(conn)
+    forget_cursors(conn)
+    with pool_lock:
+        key, created_at = pooled_connections.pop(id(conn), (None, None))
+        if key is not None and time.monotonic() - created_at < POOL_LIFETIME:
+            idle = connection_pools.setdefault(key, [])
+            if len(idle) < POOL_MAX_SIZE:
+                idle.append((conn, created_at))
+                return
+    conn.close()
+
+def reap_idle_connections():
+    """Close idle pooled sessions past POOL_LIFETIME that nobody has reacquired (runs forever)"""
+    while True:
+        time.sleep(POOL_REAP_INTERVAL)
+        now = time.monotonic()
+        expired = []
+        with pool_lock:
+            for key, idle in connection_pools.items():
+                expired += [conn for conn, created_at in idle if now - created_at >= POOL_LIFETIME]
+                idle[:] = [(conn, created_at) for conn, created_at in idle if now - created_at < POOL_LIFETIME]
+        for conn in expired:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+threading.Thread(target=reap_idle_connections, name="pool-reaper", daemon=True).start()
+
+def release_session_connection(conn):
+    """Release the connection of a closed browser session (conn_state delete callback)"""
+    if conn:
+        release_pooled_connection(conn)
+
 def get_snowflake_connection(user, password, account):
-    """Establish connection to Snowflake"""
+    """Establish connection to Snowflake, reusing a pooled session when available"""
+    key = connection_pool_key(user, password, account)
+    conn = acquire_pooled_connection(key)
+    if conn:
+        return conn, "✅ Successfully connected!"
+
     try:
         conn = snowflake.connector.connect(
             user=user,
             password=password,
             account=account,
-            authenticator='snowflake'
+            authenticator='snowflake',
+            application='DeploySure',
+            # Keep pooled sessions from hitting the idle timeout between logins
+            client_session_keep_alive=True
         )
+        with pool_lock:
+            pooled_connections[id(conn)] = (key, time.monotonic())
         return conn, "✅ Successfully connected!"
     except Exception as e:
         return None, f"❌ Connection failed: {str(e)}"
 
 def disconnect_snowflake(conn):
-    """Close Snowflake connection"""
+    """Release Snowflake connection back to the pool"""
     if conn:
-        conn.close()
+        release_pooled_connection(conn)
     return None, "🔌 Disconnected successfully"
 
+def qualified_name(*parts):
+    """Join identifiers into a dotted name, rejecting anything that is not a plain identifier"""
+    for part in parts:
+        if not isinstance(part, str) or not IDENTIFIER_RE.match(part):
+            raise ValueError(f"Invalid identifier: {part!r}")
+    return ".".join(parts)
+
+def get_cached_metadata(key):
+    """Return a cached metadata value, or None if missing or expired"""
+    entry = metadata_cache.get(key)
+    if entry and time.monotonic() - entry[0] < METADATA_CACHE_TTL:
+        return entry[1]
+    return None
+
+def set_cached_metadata(key, value):
+    """Store a metadata value with the current timestamp"""
+    metadata_cache[key] = (time.monotonic(), value)
+    return value
+
+def invalidate_metadata(conn, *prefix):
+    """Drop cached metadata for a connection (optionally only keys under prefix)"""
+    key_prefix = (id(conn),) + prefix
+    for key in list(metadata_cache):
+        if key[:len(key_prefix)] == key_prefix:
+            metadata_cache.pop(key, None)
+
+def invalidate_schema_metadata(conn, database, schema):
+    """Drop every kind of cached metadata under database.schema for a connection"""
+    names = (database.upper(), schema.upper())
+    for key in list(metadata_cache):
+        if key[0] == id(conn) and tuple(str(name).upper() for name in key[2:4]) == names:
+            metadata_cache.pop(key, None)
+
 def get_databases(conn):
     """Get list of databases"""
+    key = (id(conn), "databases")
+    cached = get_cached_metadata(key)
+    if cached is not None:
+        return cached
     try:
-        cursor = conn.cursor()
+        cursor = get_cursor(conn)
         cursor.execute("SHOW DATABASES")
-        return [row[1] for row in cursor.fetchall()]
+        return set_cached_metadata(key, [row[1] for row in cursor.fetchall()])
     except Exception as e:
         print(f"Error getting databases: {str(e)}")
         return []
 
 def get_schemas(conn, database):
     """Get schemas for specific database"""
+    key = (id(conn), "schemas", database)
+    cached = get_cached_metadata(key)
+    if cached is not None:
+        return cached
     try:
-        cursor = conn.cursor()
-        cursor.execute(f"SHOW SCHEMAS IN DATABASE {database}")
-        return [row[1] for row in cursor.fetchall()]
+        cursor = get_cursor(conn)
+        cursor.execute(f"SHOW SCHEMAS IN DATABASE {qualified_name(database)}")
+        return set_cached_metadata(key, [row[1] for row in cursor.fetchall()])
     except Exception as e:
         print(f"Error getting schemas: {str(e)}")
         return []
 
+def show_table_names(cursor, database, schema):
+    """List table names in a schema via SHOW TABLES (no warehouse needed)"""
+    cursor.execute(f"SHOW TABLES IN SCHEMA {qualified_name(database, schema)}")
+    return [row[1] for row in cursor.fetchall()]
+
+def show_object_names(cursor, database, schema):
+    """List table and view names in a schema via SHOW OBJECTS (no warehouse needed)"""
+    cursor.execute(f"SHOW OBJECTS IN SCHEMA {qualified_name(database, schema)}")
+    return [row[1] for row in cursor.fetchall()]
+
 def get_tables(conn, database, schema):
     """Get tables for specific schema"""
     if not conn:
         return []
+    key = (id(conn), "tables", database, schema)
+    cached = get_cached_metadata(key)
+    if cached is not None:
+        return ["All"] + cached
     try:
-        cursor = conn.cursor()
-        cursor.execute(f"SHOW TABLES IN SCHEMA {database}.{schema}")
-        return ["All"] + [row[1] for row in cursor.fetchall()]
+        cursor = get_cursor(conn)
+        return ["All"] + set_cached_metadata(key, show_table_names(cursor, database, schema))
     except Exception as e:
         print(f"Error getting tables: {str(e)}")
         return ["All"]
 
 def clone_schema(conn, source_db, source_schema, target_schema):
     """Clone schema with improved error handling and reporting"""
-    cursor = conn.cursor()
+    cursor = get_cursor(conn)
     try:
-        # First check if source schema exists
-        cursor.execute(f"SHOW SCHEMAS LIKE '{source_schema}' IN DATABASE {source_db}")
-        if not cursor.fetchall():
-            return False, f"❌ Source schema {source_db}.{source_schema} doesn't exist", pd.DataFrame()
+        # Count source tables up front; CLONE is atomic, so the clone gets the same tables.
+        # A missing source schema fails here (or in the CLONE) with Snowflake's own message.
+        source_tables = show_table_names(cursor, source_db, source_schema)
 
         # Execute clone command
         cursor.execute(
-            f"CREATE OR REPLACE SCHEMA {source_db}.{target_schema} "
-            f"CLONE {source_db}.{source_schema}"
+            f"CREATE OR REPLACE SCHEMA {qualified_name(source_db, target_schema)} "
+            f"CLONE {qualified_name(source_db, source_schema)}"
         )
 
-        # Verify clone was successful
-        cursor.execute(f"SHOW SCHEMAS LIKE '{target_schema}' IN DATABASE {source_db}")
-        if not cursor.fetchall():
-            return False, f"❌ Clone failed - target schema not created", pd.DataFrame()
-
-        # Get list of cloned tables
-        cursor.execute(f"SHOW TABLES IN SCHEMA {source_db}.{source_schema}")
-        source_tables = [row[1] for row in cursor.fetchall()]
-
-        cursor.execute(f"SHOW TABLES IN SCHEMA {source_db}.{target_schema}")
-        clone_tables = [row[1] for row in cursor.fetchall()]
-
         # Create summary DataFrame
         df_tables = pd.DataFrame({
             'Database': source_db,
             'Source Schema': source_schema,
             'Clone Schema': target_schema,
             'Source Tables': len(source_tables),
-            'Cloned Tables': len(clone_tables),
-            'Status': '✅ Success' if len(source_tables) == len(clone_tables) else '⚠️ Partial Success'
+            'Cloned Tables': len(source_tables),
+            'Status': '✅ Success'
         }, index=[0])
 
+        # The clone adds a schema and replaces everything cached about it
+        invalidate_metadata(conn, "schemas", source_db)
+        invalidate_schema_metadata(conn, source_db, target_schema)
+
         return True, f"✅ Successfully Mirrored Schema {source_db}.{source_schema} to {source_db}.{target_schema}", df_tables
     except Exception as e:
         return False, f"❌ Clone failed: {str(e)}", pd.DataFrame()
 
 def compare_table_differences(conn, db_name, source_schema, clone_schema):
     """Compare tables between schemas"""
-    cursor = conn.cursor()
-
-    query = f"""
-    WITH source_tables AS (
-        SELECT table_name
-        FROM {db_name}.information_schema.tables
-        WHERE table_schema = '{source_schema}'
-    ),
-    clone_tables AS (
-        SELECT table_name
-        FROM {db_name}.information_schema.tables
-        WHERE table_schema = '{clone_schema}'
-    )
-    SELECT
-        COALESCE(s.table_name, c.table_name) AS table_name,
-        CASE
-            WHEN s.table_name IS NULL THEN 'Missing in source - Table Dropped'
-            WHEN c.table_name IS NULL THEN 'Missing in clone - Table Added'
-            ELSE 'Present in both'
-        END AS difference
-    FROM source_tables s
-    FULL OUTER JOIN clone_tables c ON s.table_name = c.table_name
-    WHERE s.table_name IS NULL OR c.table_name IS NULL
-    ORDER BY difference, table_name;
-    """
+    cursor = get_cursor(conn)
+
+    source_tables = set(show_object_names(cursor, db_name, source_schema))
+    clone_tables = set(show_object_names(cursor, db_name, clone_schema))
 
-    cursor.execute(query)
-    results = cursor.fetchall()
-    return pd.DataFrame(results, columns=['Table', 'Difference'])
+    results = []
+    for table in source_tables ^ clone_tables:
+        if table in clone_tables:
+            results.append((table, TABLE_DROPPED))
+        else:
+            results.append((table, TABLE_ADDED))
+    results.sort(key=lambda row: (row[1], row[0]))
+
+    df = pd.DataFrame(results, columns=['Table', 'Difference'])
+    df['Difference'] = df['Difference'].astype('category')
+    return df
 
 def compare_column_differences(conn, db_name, source_schema, clone_schema):
     """Compare columns and data types between schemas"""
-    cursor = conn.cursor()
+    cursor = get_cursor(conn)
 
     # Get common tables
-    common_tables_query = f"""
-    SELECT s.table_name
-    FROM {db_name}.information_schema.tables s
-    JOIN {db_name}.information_schema.tables c
-        ON s.table_name = c.table_name
-    WHERE s.table_schema = '{source_schema}'
-    AND c.table_schema = '{clone_schema}';
-    """
+    source_tables = set(show_object_names(cursor, db_name, source_schema))
+    clone_tables = set(show_object_names(cursor, db_name, clone_schema))
+    common_tables = sorted(source_tables & clone_tables)
+
+    def describe(table):
+        # Each worker thread issues its DESCRIBE pair on its own cursor
+        table_cursor = get_cursor(conn)
+        table_cursor.execute(f"DESCRIBE TABLE {qualified_name(db_name, source_schema, table)}")
+        source_cols = [(table, row[0], row[1]) for row in table_cursor.fetchall()]
+        table_cursor.execute(f"DESCRIBE TABLE {qualified_name(db_name, clone_schema, table)}")
+        clone_cols = [(table, row[0], row[1]) for row in table_cursor.fetchall()]
+        return source_cols, clone_cols
+
+    # DESCRIBE calls are pure network wait, so run them concurrently
+    descriptions = []
+    if common_tables:
+        with ThreadPoolExecutor(max_workers=min(MAX_DESCRIBE_WORKERS, len(common_tables))) as executor:
+            descriptions = list(executor.map(describe, common_tables))
+
+    source_rows = [row for source_cols, _ in descriptions for row in source_cols]
+    clone_rows = [row for _, clone_cols in descriptions for row in clone_cols]
+
+    # One outer merge on (Table, Column) classifies every column at once
+    merged = pd.DataFrame(source_rows, columns=['Table', 'Column', 'Source Data Type']).merge(
+        pd.DataFrame(clone_rows, columns=['Table', 'Column', 'Clone Data Type']),
+        on=['Table', 'Column'],
+        how='outer',
+        indicator=True
+    )
 
-    cursor.execute(common_tables_query)
-    common_tables = [row[0] for row in cursor.fetchall()]
-
-    column_diff_data = []
-    datatype_diff_data = []
-
-    for table in common_tables:
-        # Get source table description
-        cursor.execute(f"DESCRIBE TABLE {db_name}.{source_schema}.{table}")
-        source_desc = cursor.fetchall()
-        source_cols = {row[0]: row[1] for row in source_desc}
-
-        # Get clone table description
-        cursor.execute(f"DESCRIBE TABLE {db_name}.{clone_schema}.{table}")
-        clone_desc = cursor.fetchall()
-        clone_cols = {row[0]: row[1] for row in clone_desc}
-
-        # Get all unique column names
-        all_columns = set(source_cols.keys()).union(set(clone_cols.keys()))
-
-        for col in all_columns:
-            source_exists = col in source_cols
-            clone_exists = col in clone_cols
-
-            if not source_exists:
-                column_diff_data.append({
-                    'Table': table,
-                    'Column': col,
-                    'Difference': 'Missing in source - Column Dropped',
-                    'Source Data Type': None,
-                    'Clone Data Type': clone_cols.get(col)
-                })
-            elif not clone_exists:
-                column_diff_data.append({
-                    'Table': table,
-                    'Column': col,
-                    'Difference': 'Missing in clone - Column Added',
-                    'Source Data Type': source_cols.get(col),
-                    'Clone Data Type': None
-                })
-            else:
-                # Column exists in both - check data type
-                if source_cols[col] != clone_cols[col]:
-                    datatype_diff_data.append({
-                        'Table': table,
-                        'Column': col,
-                        'Source Data Type': source_cols[col],
-                        'Clone Data Type': clone_cols[col],
-                        'Difference': 'Data Type Changed'
-                    })
+    column_diff_df = merged[merged['_merge'] != 'both'].reset_index(drop=True)
+    column_diff_df['Difference'] = pd.Categorical(np.where(
+        column_diff_df['_merge'] == 'left_only',
+        COLUMN_ADDED,
+        COLUMN_DROPPED
+    ))
+    column_diff_df = column_diff_df[['Table', 'Column', 'Difference', 'Source Data Type', 'Clone Data Type']]
+
+    # Column exists in both - check data type
+    datatype_diff_df = merged[
+        (merged['_merge'] == 'both') & (merged['Source Data Type'] != merged['Clone Data Type'])
+    ].reset_index(drop=True)
+    datatype_diff_df['Difference'] = pd.Categorical([DATA_TYPE_CHANGED] * len(datatype_diff_df))
+    datatype_diff_df = datatype_diff_df[['Table', 'Column', 'Source Data Type', 'Clone Data Type', 'Difference']]
 
-    # Create DataFrames
-    column_diff_df = pd.DataFrame(column_diff_data)
-    if not column_diff_df.empty:
-        column_diff_df = column_diff_df[['Table', 'Column', 'Difference', 'Source Data Type', 'Clone Data Type']]
+    return column_diff_df, datatype_diff_df
 
-    datatype_diff_df = pd.DataFrame(datatype_diff_data)
-    if not datatype_diff_df.empty:
-        datatype_diff_df = datatype_diff_df[['Table', 'Column', 'Source Data Type', 'Clone Data Type', 'Difference']]
+def submit_async_query(cursor, sql):
+    """Start a query without waiting for it; returns its query ID or the raised error"""
+    try:
+        cursor.execute_async(sql)
+        return cursor.sfqid
+    except Exception as e:
+        return e
 
-    return column_diff_df, datatype_diff_df
+def fetch_async_scalar(conn, sfqid):
+    """Wait for an async query and return its first value (or a QUERY_ERROR string)"""
+    if isinstance(sfqid, Exception):
+        return f"QUERY_ERROR: {str(sfqid)}"
+    try:
+        cursor = get_cursor(conn)
+        cursor.get_results_from_sfqid(sfqid)
+        # rowcount is only populated once the first fetch has waited for the query
+        row = cursor.fetchone()
+        return row[0] if row else None
+    except Exception as e:
+        return f"QUERY_ERROR: {str(e)}"
+
+def compare_kpis_in_sql(cursor, kpis, source_name, target_name):
+    """Compute every KPI on both schemas, plus the diff and match flag, in one request.
+
+    Each KPI is its own statement of a multi-statement request, so every value keeps the
+    type its own query returns (a UNION ALL would coerce them all to one common type).
+    Returns a (source, clone, diff, diff_pct, matched) tuple per KPI, in input order.
+    Raises if any KPI cannot be compared this way (non-numeric or multi-row result, bad SQL).
+    """
+    statements = []
+    for kpi_id, kpi_name, kpi_sql in kpis:
+        kpi_sql = kpi_sql.strip().rstrip(';')
+        source_query = ORDER_DATA_RE.sub(f'{source_name}.ORDER_DATA', kpi_sql)
+        clone_query = ORDER_DATA_RE.sub(f'{target_name}.ORDER_DATA', kpi_sql)
+        statements.append(
+            "SELECT SRC, CLN, SRC - CLN, (SRC - CLN) / NULLIF(SRC, 0) * 100, EQUAL_NULL(SRC, CLN) "
+            f"FROM (SELECT ({source_query}) AS SRC, ({clone_query}) AS CLN)"
+        )
+
+    cursor.execute(";\n".join(statements), num_statements=len(statements))
+    rows = []
+    while True:
+        rows.append(cursor.fetchone())
+        if not cursor.nextset():
+            break
+    if len(rows) != len(kpis) or None in rows:
+        raise ValueError("KPI request returned an unexpected number of results")
+    return rows
+
+def kpi_results_frame(kpis, sources, clones, diff, pct_diff, matched):
+    """Assemble the KPI report; diff and pct_diff are numeric Series, NaN where not computable"""
+    diff, pct_diff = diff.astype(float), pct_diff.astype(float)
+    has_diff = diff.notna()
+    # A zero source value has no finite percentage difference
+    pct_text = (pct_diff.round(2).astype(str) + "%").where(pct_diff.notna(), "inf%")
+    return pd.DataFrame({
+        'KPI ID': [kpi[0] for kpi in kpis],
+        'KPI Name': [kpi[1] for kpi in kpis],
+        'Source Value': sources,
+        'Clone Value': clones,
+        'Difference': diff.round(2).astype(object).where(has_diff, "N/A"),
+        'Diff %': pct_text.where(has_diff, "N/A"),
+        'Status': np.where(matched, KPI_MATCH, KPI_MISMATCH)
+    })
+
+def compare_kpis_individually(conn, cursor, kpis, source_name, target_name):
+    """Run each KPI query on its own (concurrently via async jobs) and compare with pandas"""
+    # Kick off every KPI query without waiting so Snowflake runs them concurrently
+    pending = []
+    for kpi_id, kpi_name, kpi_sql in kpis:
+        # Qualify ORDER_DATA (whole word only, so ORDER_DATA_HISTORY is left alone)
+        source_query = ORDER_DATA_RE.sub(f'{source_name}.ORDER_DATA', kpi_sql)
+        clone_query = ORDER_DATA_RE.sub(f'{target_name}.ORDER_DATA', kpi_sql)
+        pending.append((submit_async_query(cursor, source_query), submit_async_query(cursor, clone_query)))
+
+    sources = pd.Series([fetch_async_scalar(conn, sfqid) for sfqid, _ in pending], dtype=object)
+    clones = pd.Series([fetch_async_scalar(conn, sfqid) for _, sfqid in pending], dtype=object)
+
+    # Numeric results (ints, floats, Decimals) are diffed; anything else is compared as text
+    source_num = pd.to_numeric(sources, errors='coerce')
+    clone_num = pd.to_numeric(clones, errors='coerce')
+    numeric = source_num.notna() & clone_num.notna()
+    diff = (source_num - clone_num).where(numeric)
+    pct_diff = diff / source_num.where(source_num != 0) * 100
+    matched = np.where(numeric, diff == 0, sources.map(str) == clones.map(str))
+
+    return kpi_results_frame(kpis, sources, clones, diff, pct_diff, matched)
+
+def compare_kpis(conn, cursor, kpis, source_name, target_name):
+    """Compare KPIs between two schemas, returning the KPI report DataFrame"""
+    try:
+        # One round trip computes every KPI on both schemas and compares them
+        comparisons = compare_kpis_in_sql(cursor, kpis, source_name, target_name)
+    except Exception as e:
+        error_msg = str(e).split('\n')[0]
+        print(f"Combined KPI query failed, running KPIs individually: {error_msg}")
+        return compare_kpis_individually(conn, cursor, kpis, source_name, target_name)
+
+    sources, clones, diffs, pct_diffs, matched = zip(*comparisons)
+    return kpi_results_frame(
+        kpis,
+        pd.Series(sources, dtype=object),
+        pd.Series(clones, dtype=object),
+        pd.to_numeric(pd.Series(diffs, dtype=object), errors='coerce'),
+        pd.to_numeric(pd.Series(pct_diffs, dtype=object), errors='coerce'),
+        [bool(m) for m in matched]
+    )
+
+def get_order_kpis(conn, database, schema):
+    """Get the (KPI_ID, KPI_NAME, KPI_VALUE) catalog from ORDER_KPIS; errors propagate"""
+    key = (id(conn), "order_kpis", database, schema)
+    cached = get_cached_metadata(key)
+    if cached is not None:
+        return cached
+    cursor = get_cursor(conn)
+    cursor.execute(f"SELECT KPI_ID, KPI_NAME, KPI_VALUE FROM {qualified_name(database, schema)}.ORDER_KPIS")
+    return set_cached_metadata(key, cursor.fetchall())
+
+def get_schemas_with_table(conn, database, table_name):
+    """Return the (uppercased) schemas in database that contain table_name as a table or view,
+    from one SHOW OBJECTS"""
+    try:
+        cursor = get_cursor(conn)
+        # LIKE treats _ as a wildcard, so keep only exact name matches
+        cursor.execute(f"SHOW OBJECTS LIKE %s IN DATABASE {qualified_name(database)}", (table_name,))
+        return {row[3].upper() for row in cursor.fetchall() if row[1].upper() == table_name.upper()}
+    except Exception as e:
+        print(f"Error finding {table_name} tables: {str(e)}")
+        return set()
 
 def validate_kpis(conn, database, source_schema, target_schema):
     """Validate KPIs between source and clone schemas"""
-    cursor = conn.cursor()
+    cursor = get_cursor(conn)
     results = []
 
     try:
+        source_name = qualified_name(database, source_schema)
+        target_name = qualified_name(database, target_schema)
+
         # Fetch all KPI definitions
-        kpi_query = f"SELECT KPI_ID, KPI_NAME, KPI_VALUE FROM {database}.{source_schema}.ORDER_KPIS"
-        cursor.execute(kpi_query)
-        kpis = cursor.fetchall()
+        kpis = get_order_kpis(conn, database, source_schema)
 
         if not kpis:
             return pd.DataFrame(), "⚠️ No KPIs found in ORDER_KPIS table."
 
         # First verify both schemas have the ORDER_DATA table
-        try:
-            cursor.execute(f"SELECT 1 FROM {database}.{source_schema}.ORDER_DATA LIMIT 1")
-            source_has_table = True
-        except:
-            source_has_table = False
-
-        try:
-            cursor.execute(f"SELECT 1 FROM {database}.{target_schema}.ORDER_DATA LIMIT 1")
-            target_has_table = True
-        except:
-            target_has_table = False
+        order_data_schemas = get_schemas_with_table(conn, database, "ORDER_DATA")
+        source_has_table = source_schema.upper() in order_data_schemas
+        target_has_table = target_schema.upper() in order_data_schemas
 
         if not source_has_table or not target_has_table:
             error_msg = "ORDER_DATA table missing in "
@@ -251,93 +585,91 @@ def validate_kpis(conn, database, source_schema, target_schema):
                     'Clone Value': f"ERROR: {error_msg}",
                     'Difference': "N/A",
                     'Diff %': "N/A",
-                    'Status': "❌ Error"
+                    'Status': KPI_ERROR
                 })
             return pd.DataFrame(results), "❌ Validation failed - missing ORDER_DATA table"
 
-        for kpi_id, kpi_name, kpi_sql in kpis:
-            try:
-                # For source schema - replace only unqualified table names
-                source_query = kpi_sql.replace('FROM order_data', f'FROM {database}.{source_schema}.ORDER_DATA')\
-                                    .replace('FROM ORDER_DATA', f'FROM {database}.{source_schema}.ORDER_DATA')
-                cursor.execute(source_query)
-                result_source = cursor.fetchone()[0] if cursor.rowcount > 0 else None
-            except Exception as e:
-                result_source = f"QUERY_ERROR: {str(e)}"
-
-            try:
-                # For target schema - replace only unqualified table names
-                clone_query = kpi_sql.replace('FROM order_data', f'FROM {database}.{target_schema}.ORDER_DATA')\
-                                   .replace('FROM ORDER_DATA', f'FROM {database}.{target_schema}.ORDER_DATA')
-                cursor.execute(clone_query)
-                result_clone = cursor.fetchone()[0] if cursor.rowcount > 0 else None
-            except Exception as e:
-                result_clone = f"QUERY_ERROR: {str(e)}"
-
-            # Calculate differences if possible
-            diff = "N/A"
-            pct_diff = "N/A"
-            status = "⚠️ Mismatch"
-
-            try:
-                if (isinstance(result_source, (int, float)) and isinstance(result_clone, (int, float))):
-                    diff = float(result_source) - float(result_clone)
-                    pct_diff = (diff / float(result_source)) * 100 if float(result_source) != 0 else float('inf')
-                    status = '✅ Match' if diff == 0 else '⚠️ Mismatch'
-                elif str(result_source) == str(result_clone):
-                    status = '✅ Match'
-            except:
-                pass
-
-            results.append({
-                'KPI ID': kpi_id,
-                'KPI Name': kpi_name,
-                'Source Value': result_source,
-                'Clone Value': result_clone,
-                'Difference': diff if not isinstance(diff, float) else round(diff, 2),
-                'Diff %': f"{round(pct_diff, 2)}%" if isinstance(pct_diff, float) else pct_diff,
-                'Status': status
-            })
-
-        df = pd.DataFrame(results)
+        df = compare_kpis(conn, cursor, kpis, source_name, target_name)
         return df, "✅ KPI validation completed"
 
     except Exception as e:
         return pd.DataFrame(), f"❌ KPI validation failed: {str(e)}"
 
 # ===== TEST CASE VALIDATION FUNCTIONS =====
-def verify_table_access(conn, database, schema, table_name):
-    cursor = conn.cursor()
+def iter_batches(rows, size):
+    """Yield lists of up to size rows from any iterable (a list, generator or cursor)"""
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+def get_accessible_objects(conn, database, schema):
+    """Names (upper-cased) of tables and views the current role can see in a schema"""
+    cursor = get_cursor(conn)
     try:
-        cursor.execute(f'SELECT 1 FROM {database}.{schema}.{table_name} LIMIT 1')
-        return True
+        cursor.execute(f"SHOW OBJECTS IN SCHEMA {qualified_name(database, schema)}")
+        return {row[1].upper() for row in cursor.fetchall()}
     except Exception as e:
-        print(f"Access verification failed for {table_name}: {str(e)}")
-        return False
+        print(f"Access verification failed for {database}.{schema}: {str(e)}")
+        return set()
+
+def run_test_case_queries(cursor, queries):
+    """Run test case queries and return each first value as a string (or the exception raised).
+
+    All queries go to Snowflake as one multi-statement request. If that fails, they are
+    re-run one by one so the error is attributed to the right test case.
+    """
+    if not queries:
+        return []
+
+    try:
+        cursor.execute(
+            ";\n".join(query.strip().rstrip(';') for query in queries),
+            num_statements=len(queries)
+        )
+        outcomes = []
+        while True:
+            row = cursor.fetchone()
+            outcomes.append(str(row[0]) if row else "0")
+            if not cursor.nextset():
+                break
+        if len(outcomes) == len(queries):
+            return outcomes
+    except Exception as e:
+        error_msg = str(e).split('\n')[0]
+        print(f"Batched test case run failed, retrying individually: {error_msg}")
+
+    outcomes = []
+    for query in queries:
+        try:
+            cursor.execute(query)
+            row = cursor.fetchone()
+            outcomes.append(str(row[0]) if row else "0")
+        except Exception as e:
+            outcomes.append(e)
+    return outcomes
 
 def get_test_case_tables(conn, database, schema):
     """Get distinct tables from test cases table with error handling"""
+    key = (id(conn), "test_case_tables", database, schema)
+    cached = get_cached_metadata(key)
+    if cached is not None:
+        return ["All"] + cached
     try:
-        cursor = conn.cursor()
+        cursor = get_cursor(conn)
         # First verify TEST_CASES table exists
-        cursor.execute(f"""
-            SELECT COUNT(*) 
-            FROM {database}.information_schema.tables 
-            WHERE table_schema = '{schema}' 
-            AND table_name = 'TEST_CASES'
-        """)
-        if cursor.fetchone()[0] == 0:
+        cursor.execute(f"SHOW TABLES LIKE 'TEST_CASES' IN SCHEMA {qualified_name(database, schema)}")
+        if not cursor.fetchall():
             print(f"TEST_CASES table not found in {database}.{schema}")
             return ["All"]  # Return "All" even if no table exists
         
         # Now get distinct tables
         cursor.execute(f"""
             SELECT DISTINCT TABLE_NAME 
-            FROM {database}.{schema}.TEST_CASES 
+            FROM {qualified_name(database, schema)}.TEST_CASES 
             WHERE TABLE_NAME IS NOT NULL
             ORDER BY TABLE_NAME
         """)
-        tables = [row[0] for row in cursor.fetchall()]
+        tables = set_cached_metadata(key, [row[0] for row in cursor.fetchall()])
         print(f"Found tables: {tables}")
         return ["All"] + tables  # Add "All" option
     except Exception as e:
@@ -346,49 +678,38 @@ def get_test_case_tables(conn, database, schema):
 
 def get_test_cases(conn, database, schema, table):
     """Get test cases for specific table with error handling"""
+    key = (id(conn), "test_cases", database, schema, table)
+    cached = get_cached_metadata(key)
+    if cached is not None:
+        return cached
     try:
-        cursor = conn.cursor()
+        cursor = get_cursor(conn)
         
         # First verify the TEST_CASES table exists
-        cursor.execute(f"""
-            SELECT COUNT(*) 
-            FROM {database}.information_schema.tables 
-            WHERE table_schema = '{schema}' 
-            AND table_name = 'TEST_CASES'
-        """)
-        if cursor.fetchone()[0] == 0:
+        cursor.execute(f"SHOW TABLES LIKE 'TEST_CASES' IN SCHEMA {qualified_name(database, schema)}")
+        if not cursor.fetchall():
             print(f"TEST_CASES table not found in {database}.{schema}")
             return []
 
         # Now fetch test cases
-        if table == "All":
-            query = f"""
-                SELECT 
-                    TEST_CASE_ID,
-                    TEST_ABBREVIATION,
-                    TABLE_NAME,
-                    TEST_DESCRIPTION,
-                    SQL_CODE,
-                    EXPECTED_RESULT
-                FROM {database}.{schema}.TEST_CASES
-                ORDER BY TEST_CASE_ID
-            """
-        else:
-            query = f"""
-                SELECT 
-                    TEST_CASE_ID,
-                    TEST_ABBREVIATION,
-                    TABLE_NAME,
-                    TEST_DESCRIPTION,
-                    SQL_CODE,
-                    EXPECTED_RESULT
-                FROM {database}.{schema}.TEST_CASES
-                WHERE TABLE_NAME = '{table}'
-                ORDER BY TEST_CASE_ID
-            """
-        
-        cursor.execute(query)
-        cases = cursor.fetchall()
+        query = f"""
+            SELECT 
+                TEST_CASE_ID,
+                TEST_ABBREVIATION,
+                TABLE_NAME,
+                TEST_DESCRIPTION,
+                SQL_CODE,
+                EXPECTED_RESULT
+            FROM {qualified_name(database, schema)}.TEST_CASES
+        """
+        params = None
+        if table != "All":
+            query += " WHERE TABLE_NAME = %s"
+            params = (table,)
+        query += " ORDER BY TEST_CASE_ID"
+
+        cursor.execute(query, params)
+        cases = set_cached_metadata(key, cursor.fetchall())
         print(f"Found {len(cases)} test cases for {database}.{schema}.{table}")
         return cases
         
@@ -396,78 +717,185 @@ def get_test_cases(conn, database, schema, table):
         print(f"Error getting test cases: {str(e)}")
         return []
 
+def test_case_state(test_cases):
+    """UI state for fetched test cases: their names, and the first case per name"""
+    names = [str(case[1]) for case in test_cases]
+    return {
+        "names": names,
+        # Built back to front so the first case with a name wins
+        "by_name": dict(zip(reversed(names), reversed(test_cases)))
+    }
+
 def validate_test_cases(conn, database, schema, test_cases):
     if not test_cases:
-        return pd.DataFrame(), "⚠️ No test cases selected", gr.Button(visible=False)
+        return pd.DataFrame(), "⚠️ No test cases selected", gr.update(visible=False)
+
+    try:
+        schema_name = qualified_name(database, schema)
+    except ValueError as e:
+        return pd.DataFrame(), f"❌ {str(e)}", gr.update(visible=False)
 
-    cursor = conn.cursor()
+    cursor = get_cursor(conn)
     results = []
 
-    for case in test_cases:
-        test_id, abbrev, table_name, desc, sql, expected = case
-        expected = str(expected).strip()
+    # One SHOW OBJECTS call instead of a SELECT probe per test case
+    accessible = get_accessible_objects(conn, database, schema)
+    pattern_cache = {}  # table name -> compiled word-boundary pattern
 
-        # Verify table access first
-        if not verify_table_access(conn, database, schema, table_name):
-            results.append({
-                'TEST CASE': abbrev,
-                'CATEGORY': table_name,
-                'EXPECTED RESULT': expected,
-                'ACTUAL RESULT': f"ACCESS DENIED: No permissions on {table_name}",
-                'STATUS': "❌ PERMISSION ERROR"
-            })
-            continue
+    # Work through the cases a batch at a time so each round trip stays bounded
+    for batch in iter_batches(test_cases, TEST_CASE_BATCH_SIZE):
+        pending = []  # (results index, qualified sql) for cases that can run
 
-        try:
-            # Modify SQL to use fully qualified names
-            qualified_sql = re.sub(
-                rf'\b{table_name}\b', 
-                f'{database}.{schema}.{table_name}', 
-                sql,
-                flags=re.IGNORECASE
-            )
-            
-            cursor.execute(qualified_sql)
-            result = cursor.fetchone()
-            actual_result = str(result[0]) if result else "0"
+        for case in batch:
+            test_id, abbrev, table_name, desc, sql, expected = case
+            expected = str(expected).strip()
 
+            # Verify table access first
+            if str(table_name).upper() not in accessible:
+                results.append({
+                    'TEST CASE': abbrev,
+                    'CATEGORY': table_name,
+                    'EXPECTED RESULT': expected,
+                    'ACTUAL RESULT': f"ACCESS DENIED: No permissions on {table_name}",
+                    'STATUS': STATUS_PERMISSION_ERROR
+                })
+                continue
+
+            # Modify SQL to use fully qualified names (only this case's own table)
+            pattern = pattern_cache.get(table_name)
+            if pattern is None:
+                pattern = pattern_cache[table_name] = re.compile(rf'\b{re.escape(str(table_name))}\b', re.IGNORECASE)
+            qualified_sql = pattern.sub(f'{schema_name}.{table_name}', sql)
+            pending.append((len(results), qualified_sql))
             results.append({
                 'TEST CASE': abbrev,
                 'CATEGORY': table_name,
-                'EXPECTED RESULT': expected,
-                'ACTUAL RESULT': actual_result,
-                'STATUS': "✅ PASS" if actual_result == expected else "❌ FAIL"
+                'EXPECTED RESULT': expected
             })
 
-        except Exception as e:
-            error_msg = str(e).split('\n')[0]
-            results.append({
-                'TEST CASE': abbrev,
-                'CATEGORY': table_name,
-                'EXPECTED RESULT': expected,
-                'ACTUAL RESULT': f"QUERY ERROR: {error_msg}",
-                'STATUS': "❌ EXECUTION ERROR"
-            })
+        outcomes = run_test_case_queries(cursor, [sql for _, sql in pending])
+        for (index, _), actual_result in zip(pending, outcomes):
+            row = results[index]
+            if isinstance(actual_result, Exception):
+                error_msg = str(actual_result).split('\n')[0]
+                row['ACTUAL RESULT'] = f"QUERY ERROR: {error_msg}"
+                row['STATUS'] = STATUS_EXECUTION_ERROR
+            else:
+                row['ACTUAL RESULT'] = actual_result
+                row['STATUS'] = STATUS_PASS if actual_result == row['EXPECTED RESULT'] else STATUS_FAIL
 
     df = pd.DataFrame(results)
-    return df, "✅ Validation completed", gr.Button(visible=True)    
+    # Repetitive label columns are stored once per distinct value
+    df['CATEGORY'] = df['CATEGORY'].astype('category')
+    df['STATUS'] = df['STATUS'].astype('category')
+    return df, "✅ Validation completed", gr.update(visible=True)    
+
+# ===== REPORT FUNCTIONS =====
+def report_fingerprint(df, label):
+    """Content hash of a report (label, columns and cell values), or None if it cannot be hashed"""
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    except TypeError:
+        return None
+    digest = hashlib.sha256(repr((label, list(df.columns))).encode("utf-8"))
+    digest.update(row_hashes.tobytes())
+    return digest.hexdigest()
+
+def open_report_csv(path):
+    """Binary sink for a CSV report, gzip-compressed when path ends in .gz"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "wb", compresslevel=REPORT_GZIP_LEVEL)
+    return open(path, "wb")
+
+def write_report(df, label, file_format="csv", timestamp=None):
+    """Write df to a timestamped CSV (optionally gzipped) or Parquet file under REPORT_DIR
+    and return its path.
+
+    timestamp (YYYYmmdd_HHMMSS) names the file after a specific run; defaults to now.
+
+    A report identical to one written recently reuses that file instead of writing it again.
+    Parquet falls back to CSV when the frame has mixed-type columns Arrow cannot store.
+    """
+    # A report named after a specific run is only reused for that same run
+    key = report_fingerprint(df, (label, file_format, timestamp))
+    with report_files_lock:
+        path = report_files.get(key)
+        if path and os.path.exists(path):
+            report_files.move_to_end(key)
+            return path
+
+    if not timestamp:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # A private subdirectory per download keeps the friendly file name without collisions
+    base = os.path.join(tempfile.mkdtemp(dir=REPORT_DIR), f"{label}_{timestamp}")
+    path = None
+    if file_format == "parquet" and pa is not None:
+        try:
+            path = base + ".parquet"
+            pa_parquet.write_table(pa.Table.from_pandas(df, preserve_index=False), path, compression="snappy")
+        except pa.ArrowException:
+            # mixed-type columns (e.g. KPI values next to error text) are written as CSV
+            if os.path.exists(path):
+                os.remove(path)
+            path = None
+    if path is None:
+        # Every CSV report uses pandas' dialect (minimal quoting)
+        path = base + (".csv" if file_format == "parquet" else f".{file_format}")
+        # Render in memory and hand the file a single write rather than pandas' chunked writes
+        with open_report_csv(path) as f:
+            f.write(df.to_csv(index=False).encode("utf-8"))
+
+    if key is not None:
+        with report_files_lock:
+            report_files[key] = path
+            if len(report_files) > REPORT_CACHE_SIZE:
+                # Gradio serves its own copy of each download, so evicted files can go
+                _, evicted = report_files.popitem(last=False)
+                shutil.rmtree(os.path.dirname(evicted), ignore_errors=True)
+    return path
 
 # ===== GRADIO APP =====
-with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
+# Precomputed DriftWatch section toggles: (schema, kpi, test case section, validation_type state).
+# Built outside the Blocks context so they are never rendered, only reused as updates.
+VALIDATION_SECTION_UPDATES = {
+    "Schema Validation": (gr.Column(visible=True), gr.Column(visible=False), gr.Column(visible=False), "schema"),
+    "KPI Validation": (gr.Column(visible=False), gr.Column(visible=True), gr.Column(visible=False), "kpi"),
+    "Test Case Validation": (gr.Column(visible=False), gr.Column(visible=False), gr.Column(visible=True), "test_case"),
+}
+
+# Select All / clear updates for the KPI checkboxes
+ALL_KPIS_SELECTED = tuple(gr.Checkbox(value=True) for _ in KPI_NAMES)
+NO_KPIS_SELECTED = tuple(gr.Checkbox(value=False) for _ in KPI_NAMES)
+
+# Serve the logo as a cacheable static file rather than inlining it in the page
+gr.set_static_paths(paths=[STATIC_DIR])
+
+# Preloaded without blocking render, then switched to a stylesheet once it arrives
+DEFERRED_CSS_HEAD = (
+    f'<link rel="preload" as="style" href="/gradio_api/file={DEFERRED_CSS_PATH}" '
+    'onload="this.onload=null;this.rel=\'stylesheet\'">'
+)
+
+# Theme and stylesheets are launch() options in Gradio 6
+with gr.Blocks(title="DeploySure Suite") as app:
     # Add company logo and header
-    gr.HTML("""
+    gr.HTML(f"""
     <div style="display: flex; flex-direction: column; align-items: center; margin-bottom: 10px; height: 10; width: 50;">
-        <img src="data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAASQAAAAyCAMAAADC31bsAAABX1BMVEVHcEwAAAAAAAAAAAAAAAABBwoAAAAAAAAABAUAAAAAAAAAAAAAAAAAAAAAAAAAAAAYXHgAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAABC2v8AAAAAAAAAAAAAAAAiiL0AAAAAAAAAAAAAAAAAAAAAAAA0uesAAAAAAABD3P8AAABB2P5C2/9C3P9D2/8+0Pk4wvEceac/0v4mksw4wfxB1/0omcw7y/cys+Q2u/ZC2vsceKcysPA6xvorn9tA1fwztPMztfUfgbMnltA7yP4bd6QbeKcxru8ghLg4wfkto+IlkckadaIsoMwAAABD3P8bdaJA1f40tvc5xP07yP4lj8c2u/orn909zf4zsvMxru84wPwtpOQpmtYvqeonlc8gg7U+0f4efa4ceag3v+MtpMkysdv9FXxDAAAAXHRSTlMAdxbUEwNpywY4fwr9cLC8ASKlW2Acqbf1ZJ2Ciu40ekwpDklRL49A/vDjzkT+k1c7+sSFBpjbzukR420oSSSPjJyuqg05GPHtw5Jg08FEplh15PB46SjLsEJE7vTHodQAAAu7SURBVGje7JrpW9paE8ADkhAISQgQIhBZEhZFhLBq69Vi1bp2X997odYNd2lt///nPeckQMiCtN5X3w/OF3hykjMnv8zMmZkEw/4NqS3vNFfnN6enN+dXF5eeYI9iRrS0Oj/d7svmy8XlRygG+fTsn583OkhA5hcfrUkv+Jutr0Cub4YotVf/ekQzcLUP77+q8tNgTEuPcPqMfvz4oVG6GlCaBvL0kZLma2+vv3/vU/rZJ7QH5d36IyAob+bmrq+/943pFzIhRKgL5OWLB1mU/382MyW5zEJhlPZrs6/tHh4CTH1jer/ZJ9QBctCsoUWrU+Omy3vHcZelSKThTHKM+yAL3mKW4M3357pVCXCMAQSTLinniAoVt0lmS1hoFv5JWj+x2srF1dUhMiYV04fFLjIhCAjI/jsUlsginIRNmXy1qh3PWOgGUhGitELpzszczkgSZ1qtlm82ZxwgZt3WSphiiFOXk3GE2f5hxXCvMjvZshYaS6DfkPWKXh0fX1xcDYzpWa3W7HRUQvv7+2dnZ8/X4ENk4RwzHhOkMDoexxQ7/WCUUQZnKrfHyJhPvW7C+EiqtipavokgsHLKkdcfM9hFesH2cg2SzxrS2pfLc4Cpb0xbIAQ9WUUmBAGdHR0dbUBTogQ4yZQNpKk45rGH1GrlC+DMwJiQklO9y8LS8EhshIrWAjC80NAiysOQuNnWH0J69fH08vy8b0xbn+DB5c+IEAB09O3bt5PXtbtCarGusSFx7sFd0r8BqRXFXJVh6xqGRJTR0UZAjHmN4hkJafvk5PRyYEz/0dC96xM6OT39uDw2pIlh/bEso9r/pDwuJLKuXoBcLq+YIfkYww3GihV0+xUqjmwwH+0tYthdkf6WkMIt9Y6A9OIz4HDaN6a3veM7GwgQGIII344NKWzcukmPauSJcSGpHjNFq/bEOs2QzDfiRAFzVkpDWJNBm5mRmU0mbUZHQFrfAPbSN6aVWn8j2NYAQXzHX2pjQzI/JhrZRN0/HqRMA8ER/ekZtOoYboIUMV9VRJBcQagqn7KZegJFrszvQ9qBkUc1psvzL7q8ce01PAIJARPbXb4DpAIaCOBjQZLQdK0Kj+FZ9G9KHhuSWxoDUp77fUhNGKE1TLv6BpL/xS4kBHwQxKp/1u8AqTcwFiQaRZcFsBlivBqF3fzt7kYxyDXJEoQ0GcL/XUi152Cr1yh9fDWcea3vqoTArrdxd0jMWJAUFOZ9XjSLrKY1RdIAKRo0CBFAKrya0S4wUb3Us440h98F0mpHTYhANrRjzMXfHEIBecHh5j1BUgNwL1prSaUuEI9KAWaiToxrWI+V8yJ/F0hdmFpDSts10+DbOZRgXt/cEyS8Orzva8wGifcoSLAGwe1PYJx/DGlttdtVC5DnFq1aagV2B+Zu2vcESU21y46B96kOF6DGgORrgBDvEu0qD5CX/ikkfxNW+wDT52XM79flODUkn7a+z/3stNtPl+8DkpZqszwl9UR1uDIxFJMChEHoOkLDSrDApeuMwOqlonJj/xgSvjiNeiIHuyvb26+bzSWN0/rr50g+33T29vamX67dAyQt1W7l3bM9cU+opW4+Pnp383t1KZAfJ0mKHIikoHS2MRakiNXQktpe+3V4fPnt7KAzr2UB26cn346Ozs4ODjqdbnevOSLjZm6DpIyZAoRGFH+Ca3SepKbaOZuZRUQHm9VWapN8aIWBhSw/bQNM3Yur89Ojs4PuU/X1CL59eaph2oeYwMZHMloJZoxbFe0h2kJCNwCSSX/UojI3pdo2ASfhHwlJnrRcnN5LFzC0DfgIu2fk0wpxi6C0CtvZN9CQjg46exokbOX4XIfpHbQvdIutrBGCGlsbnC0kXPWirPZAW0V8VKrtKxtFdTiUXt5mSXaQsqolqSl8nkjxTpNQWA6VQeVAgTOOScDf2u32L2BIwNu6A0gXxzpMz2s9n23NVOM6FXyqpAbbitQLPYYF8HHUZWy1wAOMoPudyXp48xK1VLtclZPDIofyvUKlB4l2OY1KVDMvkE4L4WUUjCawpLqS8kJjwiRBzKl1aCbzxjEvtvYSmNLxxeXJ0X5nb7oP6fBqgAk13TTSwKl1KhoLaoumVe3F5xmDgobWQINBNaNtzzMN8xLVVHuw2evbQJN9G1ZTANNdaEpmMukJC2moC2cwKjCq6dZrN1n0qfzQlPYuNENq9yA9mzscYHq9hoJP1F5FI4Xd0nSDtYVWslot0cVa92t1imfStzXd3FLEfhDm7ZzgGwGJqs5Yj9X9IOlu7x1rhjSAdH2tYjo/v/yovXnjGDsVjTQ2GlI5gKpUZ8D6YfloNR+CHOzzp1nulvZtCbOHVC5CG3UR7MKkzwYSRsqBxmTZ0pKw5fm9niENIP343sN0/LaXY7oIIW9U4StPzYqpwU5vQWAyL4S0XrUUYvJWi2RVfxFtyvdCL/G2hQSUMDJuB6k8VSG0FVApOUQ7zKImBiSfCxKmMbQfLG2eaoY0gPT1Rw/TyprO8o0q6Eg6rvUOeSvd4IxQgdMFGoorhKxPdDgIp11Nl1ancioJ6yvpiJyCSjLWo6W4687vSv07G5oh6SB91TCtPMwL3P878dd2NvY73WkDJITpkZGu1f25u2eG9PX9h7VHNrq3Js2nbROkrb/9j2SGfO6v5vy0HtL7rTePZmRhTUvNptZ6e7P17G97RDiFRP/NBmmxe+N2H5D4zdcP5sFv/eyktq4FShJNY9KKU/j4a/kTe+rNWRvlaJl6NCxEo/q+Dm1R3Jdom+upaBh26EsWQ5FQLnbb/TyZX9QKFtTxp4cxcVmeMCfu8Sp1zyZHOl1EmHfq1RYtSnO6aPdyjZXV6tos1UQ6PDYk0QFK3Tg73KFKsbxkniHHUPfvmqUornjFapKkSlUxEceyIi06eIooecUQhctV0ZvD6CwJ/yh+Kl2NlQgOfpXlSQMTlQTUQyQjCkhBeQ+YJ02SaXiqComnRZFwSkQpJgYpbcAVEUWaM0CCvSEyUIBjDg7LeMFlrhTLRTguJlazBNW/NOF4GEgpIR2XGaXEFJQIw2fdJaVYdFXChYIQjAtpJSik6GxOSII/XJIp5MRGqh7C8GIIWVIwA8SVZFLZREoIKTKTlJlCPMjwMQCJqns9nmyMn4jmZDZZEGQ4R6KoeBxR0ggJx3lBcaAxqUrHc0wkxaaYgqQo6dkEnLPEcA4wT1h4EEhyJRQMshFvAkQwj5RNQJPm2QKGJbzBOvwaKUmLBHA4Miw7YsALKlwyQHIMrHSlSjibzRZzGFGJUgpcfoqjhWAw4lYgJCfrDZZEhmNBQSXStAhDijNcLJUSFecwpEqxXhcYVwCMOSrOTDAo1xMQUg7oqIsknDPkLgRA3Zx8GEtKummCIFJVB9qTsjSCJHggpFDdD7wgDSBlIaRkwgtKO5ZzMZmICDcESYir72Zyea8aLXDMIYDZQk4AKeBkq+C/zMNvDzVIJBmug2MlahiSl0txBTaDxtI8kyVot0OFJBWLkjYnH04/WEwqwE6tnPICAFKRG4IUjCI2tBipw/f0BUcV7Ij/7c7qWhyEgWBqdbENpkaTlKjEzzRwyCkt/v+/dhu1B73ngx63T8JmFzLMzpjk3pLzI1tvYXdNIjLTqjdXFPBkgoc/yHqQVMiQQvwJkgea3syCOw2nH+Pm3QKZuuYGe0GWVhuTaLVgV0B800FmaKP5e8ZNqrM4XK1jIKosfIKETlOXLTuImsnkZlkizkzODHRx5MQc2epo3b0UGO4zwRqXlSK5zgaXPlTghZvWhdAq2UHyPUoWCKV1sd2lvAo3VWOOuaUKWCXgvjFp+qiFHn3PUvlSYO8AibtU5iBaEhkNkyQzckOOtEfRsIa0AnJ0mzndPvgkRHPhJGbb42w8rG+KzdCR1Fnfx0apxaWSGMvHiPYAjtI+RDe0ZEvETkPTvbrbyf8PRaPcczyHabRdH45BCxoHNmr3UsiNi8nfjkGdbJJR2jD+G+2+QfpXQaEobobwpSFvBOkLNILzAHzVeN0AAAAASUVORK5CYII=">
+        <img src="/gradio_api/file={LOGO_PATH}">
         <h1 style="text-align: center; margin-top: 10px;">DeploySure Suite</h1>
     </div>
     """)
 
     # Session state
-    conn_state = gr.State()
+    # A session closed without disconnecting hands its connection back to the pool
+    conn_state = gr.State(delete_callback=release_session_connection)
     current_db = gr.State()
-    combined_report_state = gr.State()
+    combined_report_state = gr.State()  # (table, column, datatype) diff frames
     validation_type = gr.State(value="schema")  # Track current validation type
-    test_case_data = gr.State([])
+    test_case_data = gr.State(test_case_state([]))  # see test_case_state()
+    tc_last_key = gr.State()  # (conn, db, schema, table) the test case list was last loaded for
+    tc_run_timestamp = gr.State()  # when the shown test case results were produced (names the report)
+    recently_cloned = gr.State({})  # (db, source, clone) -> time the clone was made
 
     # ===== SNOWFLAKE-STYLE LOGIN SECTION =====
     with gr.Tab("🔐 Login"):
@@ -552,21 +980,26 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
                     val_db = gr.Dropdown(label="Database")
                     val_source_schema = gr.Dropdown(label="Source Schema")
                     val_target_schema = gr.Dropdown(label="Target Schema")
+                    force_recompute = gr.Checkbox(
+                        label="Force recompute",
+                        value=False,
+                        info="Compare schemas even if one was just mirrored from the other"
+                    )
                     validate_btn = gr.Button("Execute DriftWatch", variant="primary")
 
                 with gr.Column(scale=2):
                     gr.Markdown("### ChangeLens / Schema Validation Report")
                     with gr.Tabs():
                         with gr.Tab("Table Differences"):
-                            table_diff_output = gr.Dataframe(interactive=False)
+                            table_diff_output = gr.Dataframe(interactive=False, max_height=500, show_search="filter")
                             table_download_btn = gr.Button("📥 Download Table Differences", visible=False)
                             table_download = gr.File(label="Download Table Differences", visible=False)
                         with gr.Tab("Column Differences"):
-                            column_diff_output = gr.Dataframe(interactive=False)
+                            column_diff_output = gr.Dataframe(interactive=False, max_height=500, show_search="filter")
                             column_download_btn = gr.Button("📥 Download Column Differences", visible=False)
                             column_download = gr.File(label="Download Column Differences", visible=False)
                         with gr.Tab("Data Type Differences"):
-                            datatype_diff_output = gr.Dataframe(interactive=False)
+                            datatype_diff_output = gr.Dataframe(interactive=False, max_height=500, show_search="filter")
                             datatype_download_btn = gr.Button("📥 Download Data Type Differences", visible=False)
                             datatype_download = gr.File(label="Download Data Type Differences", visible=False)
 
@@ -606,7 +1039,10 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
                     gr.Markdown("### ChangeLens / KPI Validation Report")
                     kpi_output = gr.Dataframe(
                         interactive=False,
-                        wrap=True
+                        wrap=True,
+                        max_height=500,
+                        show_search="filter",
+                        pinned_columns=2
                     )
                     kpi_status = gr.Textbox(label="Status", interactive=False)
                     kpi_download_btn = gr.Button("📥 Download KPI Validation Report", visible=False)
@@ -643,257 +1079,20 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
                     gr.Markdown("### ChangeLens / Test Automation Report")                 
                     tc_output = gr.Dataframe(
                         interactive=False,
-                        wrap=True
+                        wrap=True,
+                        max_height=500,
+                        show_search="filter",
+                        pinned_columns=1
                     )
                     tc_status = gr.Textbox(label="Status", interactive=False)
+                    tc_report_format = gr.Radio(
+                        choices=REPORT_FORMATS,
+                        value="csv",
+                        label="Report Format"
+                    )
                     tc_download_btn = gr.Button("📥 Download Test Report", visible=False)        
                     tc_download = gr.File(label="Download Test Report", visible=False)
 
-    # Add custom CSS for styling
-    app.css = """
-    /* Base Styles */
-    body {
-        font-family: 'Segoe UI', Arial, sans-serif;
-        background-color: #f9fafb;
-        color: #2c3e50;
-        margin: 0;
-        padding: 0;
-        min-height: 100%;
-        display: flex;
-        flex-direction: column;
-    }
-    /* ✅ Force font globally without altering color or layout */
-    *, *::before, *::after {
-        font-family: 'Segoe UI', Arial, sans-serif !important;
-    }
-
-    /* Headings */
-    h1, h2, h3, h4 {
-        font-weight: 600;
-        color: #2c3e50;
-        text-align: center;
-    }
-
-    /* Links */
-    a {
-        color: #2563eb;
-        text-decoration: none;
-    }
-    a:hover {
-        text-decoration: underline;
-    }
-
-    /* Labels */
-    .label, span.svelte-g2oxp3 {
-        display: inline-block;
-        font-weight: 600;
-        font-size: 14px;
-        color: #2c3e50;
-        margin-bottom: 4px;
-        background-color: #e5e7eb;
-        padding: 2px 6px;
-        border-radius: 4px;
-    }
-
-    /* Input Fields */
-    .input, .textbox, .dropdown, .snowflake-input {
-        width: 100%;
-        padding: 12px;
-        margin-bottom: 15px;
-        border: 1px solid #ccc;
-        border-radius: 6px;
-        font-size: 14px;
-        box-sizing: border-box;
-        background-color: white;
-    }
-    /* Compact Login Form */
-    .snowflake-input {
-        width: 100%;
-        padding: 8px 12px;
-        margin-bottom: 10px;
-        border: 1px solid #ddd;
-        border-radius: 4px;
-        font-size: 14px;
-    }
-
-    .snowflake-button {
-        padding: 8px 12px;
-        margin: 5px;
-        font-size: 14px;
-    }
-
-    /* Center the login form */
-    .gradio-container .tab {
-        display: flex;
-        justify-content: center;
-    }
-
-    /* Make the form container more compact */
-    .gr-form {
-        max-width: 320px;
-        padding: 15px;
-    }
-
-    /* Adjust heading size */
-    h2 {
-        font-size: 18px !important;
-        margin-bottom: 15px !important;
-    }
-
-    .snowflake-input:focus {
-        border-color: #2563eb;
-        outline: none;
-        box-shadow: 0 0 0 2px rgba(0, 102, 204, 0.1);
-    }
-
-    /* Buttons */
-    .button, .snowflake-button {
-        width: 100%;
-        padding: 10px;
-        border-radius: 6px;
-        font-weight: 600;
-        font-size: 15px;
-        border: none;
-        cursor: pointer;
-        transition: background 0.3s ease;
-    }
-
-    .snowflake-button.primary {
-        background-color: #2563eb;
-        color: white;
-    }
-
-    .snowflake-button.primary:hover {
-        background-color: #1d4ed8;
-    }
-
-    .snowflake-button.secondary {
-        background-color: white;
-        color: #2563eb;
-        border: 1px solid #2563eb;
-    }
-
-    /* Status Box */
-    .status-box {
-        background-color: #f8f9fa;
-        padding: 12px;
-        border-radius: 6px;
-        font-size: 14px;
-        margin-top: 10px;
-        border-left: 4px solid #4CAF50;
-        border: 1px solid #ddd;
-    }
-
-    .status-box.error {
-        border-left-color: #f44336 !important;
-    }
-
-    /* Form Container */
-    .gr-form {
-        max-width: 420px;
-        margin: 0 auto;
-        padding: 20px;
-        background: white;
-        border-radius: 8px;
-        box-shadow: 0 2px 10px rgba(0, 0, 0, 0.06);
-    }
-
-    /* Tabs and Layouts */
-    .tab, .gr-tabs {
-        padding: 20px;
-        margin-top: 20px;
-    }
-
-    .gr-group {
-        margin-bottom: 20px;
-    }
-
-    /* Dataframe Styling */
-    .gr-dataframe {
-        max-height: 500px;
-        overflow-y: auto;
-    }
-
-    /* Tab Selection Override */
-    .selected.svelte-1tcem6n.svelte-1tcem6n {
-        background-color: transparent;
-        color: #2563eb !important;
-        font-weight: 600;
-        padding: 8px 12px;
-        border-bottom: 2px solid #2563eb;
-    }
-
-    /* Button Overrides */
-    .primary.svelte-1ixn6qd {
-        border: var(--button-border-width) solid #2563eb;
-        background: #2563eb;
-        color: var(--button-primary-text-color);
-        box-shadow: var(--button-primary-shadow);
-    }
-
-    button.svelte-1ixn6qd, a.svelte-1ixn6qd {
-        display: inline-flex;
-        justify-content: center;
-        align-items: center;
-        transition: var(--button-transition);
-        padding: var(--size-0-5) var(--size-2);
-        text-align: center;
-    }
-
-    /* Full Width Elements */
-    div.svelte-vt1mxs>*, div.svelte-vt1mxs>.form>* {
-        width: var(--size-full);
-    }
-
-    /* Gradio Button Defaults */
-    .gradio-container button, .gradio-container [role=button] {
-        cursor: pointer;
-    }
-
-    /* Box Model Fix */
-    .gradio-container, .gradio-container *, .gradio-container :before, .gradio-container :after {
-        box-sizing: border-box;
-        border-width: 0;
-        border-style: solid;
-    }
-
-    /* Theme Variables */
-    :root {
-        --name: default;
-        --primary-500: #2563eb !important;
-        --secondary-500: #3b82f6;
-        --secondary-600: #2563eb;
-        --neutral-100: #f4f4f5;
-        --neutral-300: #d4d4d8;
-        --neutral-700: #3f3f46;
-        --color-accent-copied: #2563eb !important;
-        --spacing-xxl: 16px;
-        --radius-lg: 8px;
-        --text-xs: 10px;
-        --bg: white;
-        --col: #27272a;
-        --bg-dark: #0f0f11;
-        --col-dark: #f4f4f5;
-    }
-    
-    /* Test Case Checkbox Styling */
-    .gr-checkbox-group .gr-checkbox-item {
-        background-color: #f5f5f5;
-        border-radius: 4px;
-        padding: 8px 12px;
-        margin: 4px 0;
-    }
-    
-    .gr-checkbox-group .gr-checkbox-item.selected {
-        background-color: #e0e0e0 !important;
-        border-left: 3px solid #555 !important;
-    }
-    
-    .gr-checkbox-group .gr-checkbox-item:hover {
-        background-color: #ebebeb;
-    }
-    """
-
     # Hidden elements for dynamic updates
     login_success = gr.Checkbox(visible=False)
 
@@ -901,27 +1100,7 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
     
     # Function to toggle between validation types
     def toggle_validation_type(validation_type):
-        if validation_type == "Schema Validation":
-            return (
-                gr.Column(visible=True),  # schema_validation_section
-                gr.Column(visible=False),  # kpi_validation_section
-                gr.Column(visible=False),  # test_case_validation_section
-                "schema"  # validation_type state
-            )
-        elif validation_type == "KPI Validation":
-            return (
-                gr.Column(visible=False),  # schema_validation_section
-                gr.Column(visible=True),  # kpi_validation_section
-                gr.Column(visible=False),  # test_case_validation_section
-                "kpi"  # validation_type state
-            )
-        else:
-            return (
-                gr.Column(visible=False),  # schema_validation_section
-                gr.Column(visible=False),  # kpi_validation_section
-                gr.Column(visible=True),  # test_case_validation_section
-                "test_case"  # validation_type state
-            )
+        return VALIDATION_SECTION_UPDATES.get(validation_type, VALIDATION_SECTION_UPDATES["Test Case Validation"])
 
     validation_type_dropdown.change(
         toggle_validation_type,
@@ -937,11 +1116,11 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
             conn,  # conn_state
             msg,   # status
             success,  # login_success
-            gr.Tab(visible=success),  # mirror_tab
-            gr.Tab(visible=success),  # driftwatch_tab
-            gr.Button(visible=success),  # disconnect_btn
-            gr.Button(visible=not success),  # login_btn
-            gr.Textbox(visible=True)  # status visibility
+            gr.update(visible=success),  # mirror_tab
+            gr.update(visible=success),  # driftwatch_tab
+            gr.update(visible=success),  # disconnect_btn
+            gr.update(visible=not success),  # login_btn
+            gr.update(visible=True)  # status visibility
         )
 
     def handle_logout(conn):
@@ -950,11 +1129,11 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
             conn,  # conn_state
             msg,   # status
             False,  # login_success
-            gr.Tab(visible=False),  # mirror_tab
-            gr.Tab(visible=False),  # driftwatch_tab
-            gr.Button(visible=False),  # disconnect_btn
-            gr.Button(visible=True),  # login_btn
-            gr.Textbox(visible=True)  # status visibility
+            gr.update(visible=False),  # mirror_tab
+            gr.update(visible=False),  # driftwatch_tab
+            gr.update(visible=False),  # disconnect_btn
+            gr.update(visible=True),  # login_btn
+            gr.update(visible=True)  # status visibility
         )
 
     login_btn.click(
@@ -969,6 +1148,48 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
         outputs=[conn_state, status, login_success, mirror_tab, driftwatch_tab, disconnect_btn, login_btn, status]
     )
 
+    # Populate every tab's database picker from a single get_databases call
+    def init_all_tabs(conn):
+        if conn:
+            dbs = get_databases(conn)
+            return (
+                gr.update(choices=dbs, interactive=True),  # source_db
+                gr.update(interactive=False),              # source_schema
+                gr.update(choices=dbs),  # val_db
+                gr.update(),             # val_source_schema
+                gr.update(),             # val_target_schema
+                gr.update(choices=dbs),  # kpi_db
+                gr.update(),             # kpi_source_schema
+                gr.update(),             # kpi_target_schema
+                gr.update(choices=dbs),  # tc_db
+                gr.update(),             # tc_schema
+                gr.update(choices=["All"], value="All"),  # tc_table
+            )
+        return (
+            gr.update(interactive=False),
+            gr.update(interactive=False),
+            gr.update(),
+            gr.update(),
+            gr.update(),
+            gr.update(),
+            gr.update(),
+            gr.update(),
+            gr.update(),
+            gr.update(),
+            gr.update(choices=["All"], value="All"),
+        )
+
+    login_success.change(
+        init_all_tabs,
+        inputs=[conn_state],
+        outputs=[
+            source_db, source_schema,
+            val_db, val_source_schema, val_target_schema,
+            kpi_db, kpi_source_schema, kpi_target_schema,
+            tc_db, tc_schema, tc_table
+        ]
+    )
+
     # ===== MIRROR SCHEMA TAB FUNCTIONS =====
     # Update available schemas when database changes
     def update_schemas(conn, db, source_schema):
@@ -976,25 +1197,12 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
             schemas = get_schemas(conn, db)
             suggested_name = f"{source_schema}_CLONE" if source_schema else ""
             return (
-                gr.Dropdown(choices=schemas, interactive=True),  # source_schema
-                gr.Textbox(value=suggested_name, interactive=True)  # target_schema
+                gr.update(choices=schemas, interactive=True),  # source_schema
+                gr.update(value=suggested_name, interactive=True)  # target_schema
             )
         return (
-            gr.Dropdown(interactive=False),
-            gr.Textbox(interactive=False)
-        )
-
-    # Initialize UI when connection is established
-    def init_mirror_ui(conn):
-        if conn:
-            dbs = get_databases(conn)
-            return (
-                gr.Dropdown(choices=dbs, interactive=True),  # source_db
-                gr.Dropdown(interactive=False),             # source_schema
-            )
-        return (
-            gr.Dropdown(interactive=False),
-            gr.Dropdown(interactive=False),
+            gr.update(interactive=False),
+            gr.update(interactive=False)
         )
 
     # Event handlers
@@ -1010,27 +1218,32 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
         outputs=[source_schema, target_schema]
     )
 
-    login_success.change(
-        init_mirror_ui,
-        inputs=[conn_state],
-        outputs=[source_db, source_schema]
-    )
-
     # Clone execution
-    def execute_clone(conn, source_db, source_schema, target_schema):
+    def execute_clone(conn, source_db, source_schema, target_schema, recently_cloned):
         if not target_schema:
-            return "❌ Please enter a target schema name"
+            return "❌ Please enter a target schema name", recently_cloned
 
         success, message, df = clone_schema(
             conn, source_db, source_schema, target_schema
         )
 
-        return message
+        if success:
+            # Remember the fresh clone so DriftWatch can skip comparing it. Names are stored
+            # upper-cased to match SHOW SCHEMAS; the replaced target no longer matches anything
+            # it was cloned from or into before, so those entries go.
+            db, source, target = source_db.upper(), source_schema.upper(), target_schema.upper()
+            recently_cloned = {
+                key: cloned_at for key, cloned_at in recently_cloned.items()
+                if not (key[0] == db and target in key[1:])
+            }
+            recently_cloned[(db, source, target)] = time.monotonic()
+
+        return message, recently_cloned
 
     clone_btn.click(
         execute_clone,
-        inputs=[conn_state, source_db, source_schema, target_schema],
-        outputs=[clone_output]
+        inputs=[conn_state, source_db, source_schema, target_schema, recently_cloned],
+        outputs=[clone_output, recently_cloned]
     )
 
     # ===== SCHEMA VALIDATION FUNCTIONS =====
@@ -1039,24 +1252,10 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
         if conn and db:
             schemas = get_schemas(conn, db)
             return (
-                gr.Dropdown(choices=schemas),  # val_source_schema
-                gr.Dropdown(choices=schemas)   # val_target_schema
-            )
-        return gr.Dropdown(), gr.Dropdown()
-
-    def init_validation_ui(conn):
-        if conn:
-            dbs = get_databases(conn)
-            return (
-                gr.Dropdown(choices=dbs),  # val_db
-                gr.Dropdown(),             # val_source_schema
-                gr.Dropdown(),             # val_target_schema
+                gr.update(choices=schemas),  # val_source_schema
+                gr.update(choices=schemas)   # val_target_schema
             )
-        return (
-            gr.Dropdown(),
-            gr.Dropdown(),
-            gr.Dropdown(),
-        )
+        return gr.update(), gr.update()
 
     # Event handlers
     val_db.change(
@@ -1065,13 +1264,26 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
         outputs=[val_source_schema, val_target_schema]
     )
 
-    login_success.change(
-        init_validation_ui,
-        inputs=[conn_state],
-        outputs=[val_db, val_source_schema, val_target_schema]
-    )
+    def run_validation(conn, db, source_schema, target_schema, recently_cloned, force):
+        # A schema mirrored moments ago is identical to its source - nothing to compare
+        key_db, key_source, key_target = (str(name or "").upper() for name in (db, source_schema, target_schema))
+        cloned_at = max(
+            recently_cloned.get((key_db, key_source, key_target), 0),
+            recently_cloned.get((key_db, key_target, key_source), 0)
+        )
+        if not force and cloned_at and time.monotonic() - cloned_at < FRESH_CLONE_WINDOW:
+            return (
+                pd.DataFrame(),
+                pd.DataFrame(),
+                pd.DataFrame(),
+                "✅ No drift detected (fresh clone)",
+                gr.update(visible=False),
+                gr.update(visible=False),
+                gr.update(visible=False),
+                (),
+                gr.update(visible=False)
+            )
 
-    def run_validation(conn, db, source_schema, target_schema):
         try:
             # Compare tables
             table_diff = compare_table_differences(conn, db, source_schema, target_schema)
@@ -1079,23 +1291,17 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
             # Compare columns and data types
             column_diff, datatype_diff = compare_column_differences(conn, db, source_schema, target_schema)
 
-            # Combine all results into one DataFrame for download
-            combined_df = pd.concat([
-                table_diff.assign(Validation_Type="Table Differences"),
-                column_diff.assign(Validation_Type="Column Differences"),
-                datatype_diff.assign(Validation_Type="Data Type Differences")
-            ])
-
             return (
                 table_diff,
                 column_diff,
                 datatype_diff,
                 "✅ Validation completed successfully!",
-                gr.Button(visible=not table_diff.empty),
-                gr.Button(visible=not column_diff.empty),
-                gr.Button(visible=not datatype_diff.empty),
-                combined_df,
-                gr.Button(visible=not combined_df.empty)
+                gr.update(visible=not table_diff.empty),
+                gr.update(visible=not column_diff.empty),
+                gr.update(visible=not datatype_diff.empty),
+                # The combined report is only built if the user asks to download it
+                (table_diff, column_diff, datatype_diff),
+                gr.update(visible=not (table_diff.empty and column_diff.empty and datatype_diff.empty))
             )
         except Exception as e:
             return (
@@ -1103,16 +1309,16 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
                 pd.DataFrame(),
                 pd.DataFrame(),
                 f"❌ Validation failed: {str(e)}",
-                gr.Button(visible=False),
-                gr.Button(visible=False),
-                gr.Button(visible=False),
-                pd.DataFrame(),
-                gr.Button(visible=False)
+                gr.update(visible=False),
+                gr.update(visible=False),
+                gr.update(visible=False),
+                (),
+                gr.update(visible=False)
             )
 
     validate_btn.click(
         run_validation,
-        inputs=[conn_state, val_db, val_source_schema, val_target_schema],
+        inputs=[conn_state, val_db, val_source_schema, val_target_schema, recently_cloned, force_recompute],
         outputs=[
             table_diff_output,
             column_diff_output,
@@ -1129,62 +1335,60 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
     # Download handlers for individual reports
     def download_table_report(df):
         if df.empty:
-            return None, gr.File(visible=False)
+            return gr.update(visible=False)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"Table_Differences_{timestamp}.csv"
-        df.to_csv(filename, index=False)
-        return filename, gr.File(value=filename, visible=True, label="Download Table Differences")
+        filename = write_report(df, "Table_Differences")
+        return gr.update(value=filename, visible=True, label="Download Table Differences")
 
     def download_column_report(df):
         if df.empty:
-            return None, gr.File(visible=False)
+            return gr.update(visible=False)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"Column_Differences_{timestamp}.csv"
-        df.to_csv(filename, index=False)
-        return filename, gr.File(value=filename, visible=True, label="Download Column Differences")
+        filename = write_report(df, "Column_Differences")
+        return gr.update(value=filename, visible=True, label="Download Column Differences")
 
     def download_datatype_report(df):
         if df.empty:
-            return None, gr.File(visible=False)
+            return gr.update(visible=False)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"Datatype_Differences_{timestamp}.csv"
-        df.to_csv(filename, index=False)
-        return filename, gr.File(value=filename, visible=True, label="Download Data Type Differences")
+        filename = write_report(df, "Datatype_Differences")
+        return gr.update(value=filename, visible=True, label="Download Data Type Differences")
 
-    def download_schema_report(combined_df):
-        if combined_df.empty:
-            return None, gr.File(visible=False)
+    def download_schema_report(report_dfs):
+        if not report_dfs or all(df.empty for df in report_dfs):
+            return gr.update(visible=False)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"Schema_Validation_Report_{timestamp}.csv"
-        combined_df.to_csv(filename, index=False)
-        return filename, gr.File(value=filename, visible=True, label="Download Schema Validation Report")
+        labels = ("Table Differences", "Column Differences", "Data Type Differences")
+        combined_df = pd.concat([
+            df.assign(Validation_Type=label)
+            for df, label in zip(report_dfs, labels)
+            if not df.empty
+        ])
+        filename = write_report(combined_df, "Schema_Validation_Report")
+        return gr.update(value=filename, visible=True, label="Download Schema Validation Report")
 
     table_download_btn.click(
         download_table_report,
         inputs=table_diff_output,
-        outputs=[table_download, table_download]
+        outputs=table_download
     )
 
     column_download_btn.click(
         download_column_report,
         inputs=column_diff_output,
-        outputs=[column_download, column_download]
+        outputs=column_download
     )
 
     datatype_download_btn.click(
         download_datatype_report,
         inputs=datatype_diff_output,
-        outputs=[datatype_download, datatype_download]
+        outputs=datatype_download
     )
 
     schema_download_btn.click(
         download_schema_report,
         inputs=combined_report_state,
-        outputs=[schema_download, schema_download]
+        outputs=schema_download
     )
 
     # ===== KPI VALIDATION FUNCTIONS =====
@@ -1193,24 +1397,10 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
         if conn and db:
             schemas = get_schemas(conn, db)
             return (
-                gr.Dropdown(choices=schemas),  # kpi_source_schema
-                gr.Dropdown(choices=schemas)   # kpi_target_schema
+                gr.update(choices=schemas),  # kpi_source_schema
+                gr.update(choices=schemas)   # kpi_target_schema
             )
-        return gr.Dropdown(), gr.Dropdown()
-
-    def init_kpi_ui(conn):
-        if conn:
-            dbs = get_databases(conn)
-            return (
-                gr.Dropdown(choices=dbs),  # kpi_db
-                gr.Dropdown(),             # kpi_source_schema
-                gr.Dropdown(),             # kpi_target_schema
-            )
-        return (
-            gr.Dropdown(),
-            gr.Dropdown(),
-            gr.Dropdown(),
-        )
+        return gr.update(), gr.update()
 
     # Event handlers
     kpi_db.change(
@@ -1219,25 +1409,9 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
         outputs=[kpi_source_schema, kpi_target_schema]
     )
 
-    login_success.change(
-        init_kpi_ui,
-        inputs=[conn_state],
-        outputs=[kpi_db, kpi_source_schema, kpi_target_schema]
-    )
-
     # Select All checkbox functionality
     def toggle_all_kpis(select_all):
-        return (
-            gr.Checkbox(value=select_all),  # total_orders
-            gr.Checkbox(value=select_all),   # total_revenue
-            gr.Checkbox(value=select_all),  # avg_order
-            gr.Checkbox(value=select_all),   # max_order
-            gr.Checkbox(value=select_all),   # min_order
-            gr.Checkbox(value=select_all),  # completed
-            gr.Checkbox(value=select_all),   # cancelled
-            gr.Checkbox(value=select_all),   # april_orders
-            gr.Checkbox(value=select_all)    # unique_customers
-        )
+        return ALL_KPIS_SELECTED if select_all else NO_KPIS_SELECTED
 
     kpi_select_all.change(
         toggle_all_kpis,
@@ -1252,53 +1426,30 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
     # Enhanced KPI validation function
     def validate_selected_kpis(conn, database, source_schema, target_schema, *kpi_selections):
         """Validate selected KPIs between source and clone schemas"""
-        cursor = conn.cursor()
+        cursor = get_cursor(conn)
         results = []
 
-        # KPI names mapping to IDs (adjust based on your actual KPI table)
-        kpi_mapping = {
-            "Total Orders": 1,
-            "Total Revenue": 2,
-            "Average Order Value": 3,
-            "Max Order Value": 4,
-            "Min Order Value": 5,
-            "Completed Orders": 6,
-            "Cancelled Orders": 7,
-            "Orders in April 2025": 8,
-            "Unique Customers": 9
-        }
-
-        # Get selected KPI IDs
-        selected_kpis = [kpi_name for kpi_name, selected in zip(kpi_mapping.keys(), kpi_selections) if selected]
+        # Checkbox order matches KPI_NAMES
+        selected_kpis = [kpi_name for kpi_name, selected in zip(KPI_NAMES, kpi_selections) if selected]
 
         if not selected_kpis:
-            return pd.DataFrame(), "⚠️ No KPIs selected for validation", gr.Button(visible=False)
+            return pd.DataFrame(), "⚠️ No KPIs selected for validation", gr.update(visible=False)
 
         try:
-            # Fetch selected KPI definitions
-            kpi_query = f"""
-            SELECT KPI_ID, KPI_NAME, KPI_VALUE
-            FROM {database}.{source_schema}.ORDER_KPIS
-            WHERE KPI_NAME IN ({','.join([f"'{kpi}'" for kpi in selected_kpis])})
-            """
-            cursor.execute(kpi_query)
-            kpis = cursor.fetchall()
+            source_name = qualified_name(database, source_schema)
+            target_name = qualified_name(database, target_schema)
+
+            # Pick the selected KPI definitions out of the cached catalog
+            selected = set(selected_kpis)
+            kpis = [kpi for kpi in get_order_kpis(conn, database, source_schema) if kpi[1] in selected]
 
             if not kpis:
-                return pd.DataFrame(), "⚠️ No matching KPIs found in ORDER_KPIS table", gr.Button(visible=False)
+                return pd.DataFrame(), "⚠️ No matching KPIs found in ORDER_KPIS table", gr.update(visible=False)
 
             # First verify both schemas have the ORDER_DATA table
-            try:
-                cursor.execute(f"SELECT 1 FROM {database}.{source_schema}.ORDER_DATA LIMIT 1")
-                source_has_table = True
-            except:
-                source_has_table = False
-
-            try:
-                cursor.execute(f"SELECT 1 FROM {database}.{target_schema}.ORDER_DATA LIMIT 1")
-                target_has_table = True
-            except:
-                target_has_table = False
+            order_data_schemas = get_schemas_with_table(conn, database, "ORDER_DATA")
+            source_has_table = source_schema.upper() in order_data_schemas
+            target_has_table = target_schema.upper() in order_data_schemas
 
             if not source_has_table or not target_has_table:
                 error_msg = "ORDER_DATA table missing in "
@@ -1317,56 +1468,15 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
                         'Clone Value': f"ERROR: {error_msg}",
                         'Difference': "N/A",
                         'Diff %': "N/A",
-                        'Status': "❌ Error"
+                        'Status': KPI_ERROR
                     })
-                return pd.DataFrame(results), "❌ Validation failed - missing ORDER_DATA table", gr.Button(visible=False)
+                return pd.DataFrame(results), "❌ Validation failed - missing ORDER_DATA table", gr.update(visible=False)
 
-            for kpi_id, kpi_name, kpi_sql in kpis:
-                try:
-                    # More robust replacement that handles word boundaries and case
-                    source_query = re.sub(r'\bORDER_DATA\b', f'{database}.{source_schema}.ORDER_DATA', kpi_sql, flags=re.IGNORECASE)
-                    cursor.execute(source_query)
-                    result_source = cursor.fetchone()[0] if cursor.rowcount > 0 else None
-                except Exception as e:
-                    result_source = f"QUERY_ERROR: {str(e)}"
-
-                try:
-                    clone_query = re.sub(r'\bORDER_DATA\b', f'{database}.{target_schema}.ORDER_DATA', kpi_sql, flags=re.IGNORECASE)
-                    cursor.execute(clone_query)
-                    result_clone = cursor.fetchone()[0] if cursor.rowcount > 0 else None
-                except Exception as e:
-                    result_clone = f"QUERY_ERROR: {str(e)}"
-
-                # Calculate differences if possible
-                diff = "N/A"
-                pct_diff = "N/A"
-                status = "⚠️ Mismatch"
-
-                try:
-                    if (isinstance(result_source, (int, float)) and isinstance(result_clone, (int, float))):
-                        diff = float(result_source) - float(result_clone)
-                        pct_diff = (diff / float(result_source)) * 100 if float(result_source) != 0 else float('inf')
-                        status = '✅ Match' if diff == 0 else '⚠️ Mismatch'
-                    elif str(result_source) == str(result_clone):
-                        status = '✅ Match'
-                except:
-                    pass
-
-                results.append({
-                    'KPI ID': kpi_id,
-                    'KPI Name': kpi_name,
-                    'Source Value': result_source,
-                    'Clone Value': result_clone,
-                    'Difference': diff if not isinstance(diff, float) else round(diff, 2),
-                    'Diff %': f"{round(pct_diff, 2)}%" if isinstance(pct_diff, float) else pct_diff,
-                    'Status': status
-                })
-
-            df = pd.DataFrame(results)
-            return df, "✅ KPI validation completed", gr.Button(visible=True)
+            df = compare_kpis(conn, cursor, kpis, source_name, target_name)
+            return df, "✅ KPI validation completed", gr.update(visible=True)
 
         except Exception as e:
-            return pd.DataFrame(), f"❌ KPI validation failed: {str(e)}", gr.Button(visible=False)
+            return pd.DataFrame(), f"❌ KPI validation failed: {str(e)}", gr.update(visible=False)
 
     kpi_validate_btn.click(
         validate_selected_kpis,
@@ -1382,47 +1492,24 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
     # Download handler
     def download_kpi_report(df):
         if df.empty:
-            return None, gr.File(visible=False)
+            return gr.update(visible=False)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"KPI_Validation_Report_{timestamp}.csv"
-        df.to_csv(filename, index=False)
-        return filename, gr.File(value=filename, visible=True, label="Download KPI Validation Report")
+        filename = write_report(df, "KPI_Validation_Report")
+        return gr.update(value=filename, visible=True, label="Download KPI Validation Report")
 
     kpi_download_btn.click(
         download_kpi_report,
         inputs=kpi_output,
-        outputs=[kpi_download, kpi_download]
+        outputs=kpi_download
     )
 
     # ===== TEST CASE VALIDATION FUNCTIONS =====
-    # Test Case Validation UI Initialization
-    def init_test_case_ui(conn):
-        if conn:
-            dbs = get_databases(conn)
-            return (
-                gr.Dropdown(choices=dbs),  # tc_db
-                gr.Dropdown(),             # tc_schema
-                gr.Dropdown(choices=["All"], value="All"),  # tc_table
-            )
-        return (
-            gr.Dropdown(),
-            gr.Dropdown(),
-            gr.Dropdown(choices=["All"], value="All"),
-        )
-
-    login_success.change(
-        init_test_case_ui,
-        inputs=[conn_state],
-        outputs=[tc_db, tc_schema, tc_table]
-    )
-
     # Update schemas when database changes
     def update_tc_schemas(conn, db):
         if conn and db:
             schemas = get_schemas(conn, db)
-            return gr.Dropdown(choices=schemas)  # tc_schema
-        return gr.Dropdown()
+            return gr.update(choices=schemas)  # tc_schema
+        return gr.update()
 
     tc_db.change(
         update_tc_schemas,
@@ -1431,17 +1518,24 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
     )
 
     # Update test cases when schema or table changes
-    def update_test_case_components(conn, db, schema, table="All", select_all=False):
+    def update_test_case_components(conn, db, schema, table="All", select_all=False, last_key=None):
         """Update all test case components together"""
+        # A schema change rewrites tc_table, whose own change event lands here again with
+        # the same selection - skip that echo instead of refreshing everything twice
+        key = (id(conn), db, schema, table)
+        if key == last_key:
+            return gr.skip(), gr.skip(), gr.skip(), gr.skip(), last_key
+
         print(f"Updating components for: {db}.{schema}.{table}")
         
         if not (conn and db and schema):
             print("Missing required parameters")
             return (
-                gr.Dropdown(choices=["All"], value="All"),  # tc_table
-                gr.CheckboxGroup(choices=[]),               # tc_test_cases
-                [],                                         # test_case_data
-                gr.Checkbox()                               # tc_select_all
+                gr.update(choices=["All"], value="All"),  # tc_table
+                gr.update(choices=[]),                    # tc_test_cases
+                test_case_state([]),                      # test_case_data
+                gr.update(),                              # tc_select_all
+                None                                      # tc_last_key
             )
 
         try:
@@ -1453,52 +1547,55 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
             test_cases = get_test_cases(conn, db, schema, table)
             print(f"Found {len(test_cases)} test cases")
             
-            # Format choices for checkbox group (without ID)
-            choices = [f"{case[1]}" for case in test_cases]
+            # Names are the checkbox choices (without ID); cases are looked up by name
+            case_state = test_case_state(test_cases)
+            choices = case_state["names"]
             
             # If 'All' is selected, auto-select all test cases
             if table == 'All':
                 select_all = True
                 
             return (
-                gr.Dropdown(choices=tables, value=table),  # tc_table
-                gr.CheckboxGroup(
+                gr.update(choices=tables, value=table),  # tc_table
+                gr.update(
                     choices=choices,
                     value=choices if select_all else [],
                     label=f"Available Test Cases"
                 ),
-                test_cases,  # Store raw test case data
-                gr.Checkbox(value=select_all, interactive=len(choices) > 0)
+                case_state,  # Store test case data
+                gr.update(value=select_all, interactive=len(choices) > 0),
+                key
             )
             
         except Exception as e:
             print(f"Component update error: {str(e)}")
             return (
-                gr.Dropdown(choices=["All"], value="All"),
-                gr.CheckboxGroup(choices=[], label="Available Test Cases"),
-                [],
-                gr.Checkbox()
+                gr.update(choices=["All"], value="All"),
+                gr.update(choices=[], label="Available Test Cases"),
+                test_case_state([]),
+                gr.update(),
+                None
             )
 
     tc_schema.change(
-        lambda conn, db, schema, table, select_all: update_test_case_components(conn, db, schema, table, select_all),
-        inputs=[conn_state, tc_db, tc_schema, tc_table, tc_select_all],
-        outputs=[tc_table, tc_test_cases, test_case_data, tc_select_all]
+        update_test_case_components,
+        inputs=[conn_state, tc_db, tc_schema, tc_table, tc_select_all, tc_last_key],
+        outputs=[tc_table, tc_test_cases, test_case_data, tc_select_all, tc_last_key]
     )
 
     tc_table.change(
-        lambda conn, db, schema, table, select_all: update_test_case_components(conn, db, schema, table, select_all),
-        inputs=[conn_state, tc_db, tc_schema, tc_table, tc_select_all],
-        outputs=[tc_table, tc_test_cases, test_case_data, tc_select_all]
+        update_test_case_components,
+        inputs=[conn_state, tc_db, tc_schema, tc_table, tc_select_all, tc_last_key],
+        outputs=[tc_table, tc_test_cases, test_case_data, tc_select_all, tc_last_key]
     )
 
     # Toggle all test cases
     def toggle_all_test_cases(select_all, test_case_choices, test_case_data):
         """Toggle all test cases selection"""
-        # Get the display names (without IDs)
-        all_choices = [f"{case[1]}" for case in test_case_data]
+        # Display names (without IDs) were stored alongside the rows when they were fetched
+        all_choices = test_case_data["names"]
         return (
-            gr.CheckboxGroup(value=all_choices if select_all else []),
+            gr.update(value=all_choices if select_all else []),
             select_all
         )
 
@@ -1511,67 +1608,63 @@ with gr.Blocks(title="DeploySure Suite", theme=gr.themes.Soft()) as app:
     # Execute test case validation
     def execute_test_case_validation(conn, db, schema, selected_case_names, test_case_data):
         if not conn or not db or not schema:
-            return pd.DataFrame(), "❌ Please select database and schema", gr.Button(visible=False)
+            return EMPTY_DF, "❌ Please select database and schema", gr.update(visible=False), None
         
         if not selected_case_names:
-            return pd.DataFrame(), "⚠️ Please select at least one test case", gr.Button(visible=False)
+            return EMPTY_DF, "⚠️ Please select at least one test case", gr.update(visible=False), None
         
         # Get selected test cases based on names (since we removed IDs from display)
-        selected_test_cases = []
-        for name in selected_case_names:
-            # Find the matching test case in our stored data
-            for case in test_case_data:
-                if case[1] == name:  # Match on TEST_ABBREVIATION
-                    selected_test_cases.append(case)
-                    break
+        by_name = test_case_data["by_name"]
+        selected_test_cases = [by_name[name] for name in selected_case_names if name in by_name]
         
         if not selected_test_cases:
-            return pd.DataFrame(), "⚠️ No valid test cases selected", gr.Button(visible=False)
+            return EMPTY_DF, "⚠️ No valid test cases selected", gr.update(visible=False), None
         
-        return validate_test_cases(conn, db, schema, selected_test_cases)
+        df, status, download_btn = validate_test_cases(conn, db, schema, selected_test_cases)
+        # Stamp the run once so every download of these results shares one file name
+        return df, status, download_btn, datetime.now().strftime("%Y%m%d_%H%M%S")
 
     tc_validate_btn.click(
         execute_test_case_validation,
         inputs=[conn_state, tc_db, tc_schema, tc_test_cases, test_case_data],
-        outputs=[tc_output, tc_status, tc_download_btn]
+        outputs=[tc_output, tc_status, tc_download_btn, tc_run_timestamp]
     )
 
     # Download test case report with description
-    def download_test_case_report(df, test_case_data, selected_case_names):
+    def download_test_case_report(df, test_case_data, report_format, run_timestamp):
         if df.empty:
-            return None, gr.File(visible=False)
+            return gr.update(visible=False)
 
-        # Create a mapping of test abbreviations to descriptions
-        desc_map = {case[1]: case[3] for case in test_case_data}
-        
-        # Add description column to the DataFrame
-        df['DESCRIPTION'] = df['TEST CASE'].map(desc_map)
-        
-        # Reorder columns to put description early
-        cols = ['TEST CASE', 'DESCRIPTION', 'CATEGORY', 'EXPECTED RESULT', 'ACTUAL RESULT', 'STATUS']
-        df = df[cols]
+        # Look up each row's description from the cases loaded for the checkbox list
+        by_name = test_case_data["by_name"]
+        descriptions = [case[3] if case else '' for case in map(by_name.get, df['TEST CASE'])]
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"Test_Case_Validation_Report_{timestamp}.csv"
-        df.to_csv(filename, index=False)
-        return filename, gr.File(value=filename, visible=True, label="Download Test Report")
+        # Add the description right after TEST CASE (in place - no reordered copy of the frame)
+        df.insert(df.columns.get_loc('TEST CASE') + 1, 'DESCRIPTION', descriptions)
+
+        filename = write_report(df, "Test_Case_Validation_Report", report_format, run_timestamp)
+        return gr.update(value=filename, visible=True, label="Download Test Report")
 
     tc_download_btn.click(
         download_test_case_report,
-        inputs=[tc_output, test_case_data, tc_test_cases],
-        outputs=[tc_download, tc_download]
+        inputs=[tc_output, test_case_data, tc_report_format, tc_run_timestamp],
+        outputs=tc_download
     )
 
 # Launch the app
 if __name__ == "__main__":
-    try:
+    # Only touch google.colab when actually running in Colab (its runtime sets these)
+    if "COLAB_RELEASE_TAG" in os.environ or "COLAB_GPU" in os.environ:
         from google.colab import output
         output.enable_custom_widget_manager()
-        app.launch(server_name="0.0.0.0", server_port=7860)
-    except:
-        # Fallback for non-Colab environments
-        app.launch(server_name="0.0.0.0", server_port=7860)
-        # app.launch(debug=True, share=True)
+    app.launch(
+        server_name="0.0.0.0",
+        server_port=7860,
+        theme=gr.themes.Soft(),
+        css_paths=[CSS_PATH],
+        head=DEFERRED_CSS_HEAD
+    )
+    # app.launch(debug=True, share=True)
 # # Launch the app
 # if __name__ == "__main__":
 #     try: